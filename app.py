@@ -1,15 +1,29 @@
 import os
 import json
 import csv
+import hmac
+import io
+import tempfile
+import threading
 from datetime import datetime
+from collections import namedtuple
+from contextlib import contextmanager
 from functools import wraps
 from filelock import FileLock
 import numpy as np
+import orjson
 import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, send_file
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from werkzeug.security import check_password_hash, generate_password_hash
 from werkzeug.serving import run_simple
 
+# Optional: JIT-compile the normalization kernel when numba is installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
@@ -21,23 +35,76 @@ SCORES_FILE = os.path.join(BASE_DIR, 'scores.csv')
 LOCK_FILE = os.path.join(BASE_DIR, 'scores.csv.lock')
 STATE_LOCK_FILE = os.path.join(BASE_DIR, 'state.json.lock')
 
+# Non-score columns of scores.csv
+SCORE_META_COLUMNS = ['timestamp', 'round', 'judge', 'team_id', 'team_name']
+
+
+# Parsed config.json, reloaded only when the file's mtime changes
+_config_cache = {'mtime': None, 'data': None}
+_judges_cache = {'mtime': None, 'data': None}
+_admins_cache = {'mtime': None, 'data': None}
+_criteria_cache = {'mtime': None, 'data': None}
+
+# config.json mtime at which the scores.csv header last matched the criteria
+_scores_header_cache = {'mtime': None}
+
+# Parsed scores.csv and normalized results, reused until scores.csv changes
+_scores_cache = {'stamp': None, 'rows': 0, 'df': None, 'data': [], 'by_key': {}, 'judge_teams': {}}
+_normalized_cache = {}
+
 
 def load_config():
-    """Load configuration from JSON file."""
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    """Load configuration from JSON file (cached until the file changes)."""
+    mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    if mtime != _config_cache['mtime']:
+        with open(CONFIG_FILE, 'r') as f:
+            _config_cache['data'] = json.load(f)
+        _config_cache['mtime'] = mtime
+    return _config_cache['data']
+
+
+def _derived_from_config(cache, build):
+    """Return build(config), recomputed only when config.json changes."""
+    config = load_config()
+    mtime = _config_cache['mtime']
+    if cache['mtime'] != mtime:
+        cache['data'] = build(config)
+        cache['mtime'] = mtime
+    return cache['data']
 
 
 def get_judges():
     """Get list of judges from config."""
-    config = load_config()
-    return {j['username']: j['password'] for j in config['judges']}
+    return _derived_from_config(
+        _judges_cache,
+        lambda config: {j['username']: j['password'] for j in config['judges']}
+    )
 
 
 def get_admins():
     """Get list of admins from config."""
-    config = load_config()
-    return {a['username']: a['password'] for a in config.get('admins', [])}
+    return _derived_from_config(
+        _admins_cache,
+        lambda config: {a['username']: a['password'] for a in config.get('admins', [])}
+    )
+
+
+# Checked against for unknown usernames, so a login takes the same time
+# whether or not the username exists
+_DUMMY_PASSWORD_HASH = generate_password_hash('dummy-password')
+
+
+def check_password(stored, password):
+    """
+    Check a login password against a value from config.json.
+    Accepts werkzeug password hashes (see `flask --app app hash-password`)
+    as well as legacy plaintext entries.
+    """
+    # Passwords written as JSON numbers compare as their text form
+    stored = str(stored)
+    if stored.startswith(('scrypt:', 'pbkdf2:')):
+        return check_password_hash(stored, password)
+    return hmac.compare_digest(stored.encode(), password.encode())
 
 
 def get_teams():
@@ -52,6 +119,23 @@ def get_criteria():
     return config['criteria']
 
 
+# Values derived from the criteria config; max_scores is an array aligned with ids
+CriteriaInfo = namedtuple('CriteriaInfo', ['ids', 'names', 'max_possible', 'max_scores'])
+
+
+def _criteria_cached():
+    """Get the CriteriaInfo for the criteria config."""
+    def build(config):
+        criteria = config['criteria']
+        return CriteriaInfo(
+            tuple(c['id'] for c in criteria),
+            {c['id']: c['name'] for c in criteria},
+            sum(c['max_score'] for c in criteria),
+            np.array([c['max_score'] for c in criteria], dtype=np.int32)
+        )
+    return _derived_from_config(_criteria_cache, build)
+
+
 def get_rounds():
     """Get list of rounds from config."""
     config = load_config()
@@ -123,99 +207,294 @@ def set_scoring_open(is_open):
             json.dump(state, f, indent=2)
 
 
+# Serializes scores.csv writers within this process
+_scores_lock = threading.Lock()
+
+
+def _scores_write_lock():
+    """
+    Lock guarding single-row appends to the scores CSV.
+    Uses a cross-process file lock so several workers (e.g. gunicorn) can
+    append safely; set "multi_process_locking": false in config.json to
+    use a cheaper per-process lock when running a single process.
+    """
+    if load_config().get('multi_process_locking', True):
+        return FileLock(LOCK_FILE, timeout=10)
+    return _scores_lock
+
+
+@contextmanager
+def _scores_rewrite_lock():
+    """
+    Lock for paths that replace the whole scores CSV (migration, compaction).
+    Always takes the file lock so no other process is mid-rewrite, plus
+    the in-process lock so this process's appends can't be lost.
+    """
+    with _scores_lock, FileLock(LOCK_FILE, timeout=10):
+        yield
+
+
 def init_scores_file():
     """Initialize the scores CSV file if it doesn't exist or update headers if needed."""
-    criteria = get_criteria()
-    new_headers = ['timestamp', 'round', 'judge', 'team_id', 'team_name'] + [c['id'] for c in criteria]
+    new_headers = _scores_headers()
     
-    if not os.path.exists(SCORES_FILE):
-        with open(SCORES_FILE, 'w', newline='') as f:
+    # O_EXCL makes creation atomic, so concurrently starting workers
+    # can't both create (and truncate) the file
+    try:
+        fd = os.open(SCORES_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        fd = None
+    
+    if fd is not None:
+        with os.fdopen(fd, 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(new_headers)
     else:
-        # Check if file has old format (without round column) and migrate
-        lock = FileLock(LOCK_FILE, timeout=10)
-        with lock:
-            with open(SCORES_FILE, 'r', newline='') as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-            
-            if rows and 'round' not in rows[0]:
-                # Migrate old format to new format
-                old_headers = rows[0]
-                # Insert 'round' after 'timestamp'
-                migrated_rows = [new_headers]
-                for row in rows[1:]:
-                    # Insert default round value
-                    new_row = [row[0], 'round1'] + row[1:]
-                    migrated_rows.append(new_row)
-                
-                with open(SCORES_FILE, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerows(migrated_rows)
+        # Migrate files from before the 'round' column or older criteria;
+        # always check the file itself, even if it was verified before
+        _scores_header_cache['mtime'] = None
+        _sync_scores_header()
+
+
+def _scores_headers():
+    """Column headers for the scores CSV."""
+    return SCORE_META_COLUMNS + list(_criteria_cached().ids)
+
+
+def _read_scores_header():
+    """Return the header row of the scores CSV ([] if the file is empty)."""
+    with open(SCORES_FILE, 'r', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def _migrated_scores_headers(file_headers):
+    """
+    Return the headers the scores CSV should be rewritten with, or None if
+    it already starts with the current layout. Columns of criteria that
+    were removed from config.json are kept at the end so no scores are lost.
+    """
+    current = _scores_headers()
+    if file_headers[:len(current)] == current:
+        return None
+    return current + [h for h in file_headers if h not in current]
+
+
+def _sync_scores_header():
+    """
+    Rewrite the scores CSV under the current header layout if the file
+    predates the 'round' column or the criteria in config.json changed.
+    Columns are matched by name; missing values default to round1 / 0.
+    The header can only go stale when config.json changes, so the file is
+    only checked once per config version.
+    """
+    load_config()
+    mtime = _config_cache['mtime']
+    if _scores_header_cache['mtime'] == mtime:
+        return
+    
+    try:
+        if _migrated_scores_headers(_read_scores_header()) is None:
+            _scores_header_cache['mtime'] = mtime
+            return
+    except FileNotFoundError:
+        return
+    
+    with _scores_rewrite_lock():
+        with open(SCORES_FILE, 'r', newline='') as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            return
+        
+        old_headers = rows[0]
+        new_headers = _migrated_scores_headers(old_headers)
+        if new_headers is None:
+            # Another writer migrated the file first
+            _scores_header_cache['mtime'] = mtime
+            return
+        
+        current_headers = _scores_headers()
+        migrated_rows = [new_headers]
+        for row in rows[1:]:
+            # Rows wider than the old header were appended after the
+            # criteria changed, so they use the current layout
+            headers = current_headers if len(row) > len(old_headers) else old_headers
+            values = {'round': 'round1', **dict(zip(headers, row))}
+            migrated_rows.append([values.get(col, 0) for col in new_headers])
+        
+        # Swap in atomically - readers don't take the lock
+        tmp_file = SCORES_FILE + '.tmp'
+        with open(tmp_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerows(migrated_rows)
+        os.replace(tmp_file, SCORES_FILE)
+        _scores_header_cache['mtime'] = mtime
 
 
 def save_scores(judge, team_id, team_name, scores, round_id=None):
-    """Save scores to CSV file with file locking for concurrent access."""
+    """
+    Append a score row to the CSV file with file locking for concurrent access.
+    Re-scoring a team appends a new row; get_all_scores() keeps only the
+    latest row per (round, judge, team).
+    """
     if round_id is None:
         round_id = get_active_round()
     
-    lock = FileLock(LOCK_FILE, timeout=10)
+    row_values = [scores.get(cid, 0) for cid in _criteria_cached().ids]
+    timestamp = datetime.now().isoformat()
     
-    with lock:
-        # Read existing scores
-        existing_rows = []
-        if os.path.exists(SCORES_FILE):
-            with open(SCORES_FILE, 'r', newline='') as f:
-                reader = csv.reader(f)
-                existing_rows = list(reader)
+    # Format the row before taking the lock so the locked section is a
+    # single write of one complete line
+    line = io.StringIO()
+    csv.writer(line).writerow([timestamp, round_id, judge, team_id, team_name, *row_values])
+    
+    # The row uses the current criteria, so the file header must too
+    _sync_scores_header()
+    
+    with _scores_write_lock():
+        with open(SCORES_FILE, 'a', newline='') as f:
+            # File was removed or truncated since startup - restore headers
+            if f.tell() == 0:
+                csv.writer(f).writerow(_scores_headers())
+            f.write(line.getvalue())
+
+
+def _dedupe_scores(rows):
+    """
+    Collapse repeated submissions, keeping the latest row per (round, judge, team).
+    A re-scored entry keeps the position of its first submission.
+    Returns a dict mapping (round, judge, team_id) to the latest row.
+    """
+    latest = {}
+    for row in rows:
+        latest[(row.get('round'), row.get('judge'), row.get('team_id'))] = row
+    return latest
+
+
+def _scores_stamp():
+    """Return (mtime, size) of the scores CSV, or None if it doesn't exist."""
+    try:
+        st = os.stat(SCORES_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_scores():
+    """
+    Return the parsed scores cache, re-reading the CSV only if it changed.
+    'df' holds the deduplicated scores as a DataFrame; 'data' holds the
+    same rows as dicts and 'rows' counts the rows in the file before
+    deduplication. Alongside them the cache holds lookup indexes:
+    'by_key' maps (round, judge, team_id) to a row and 'judge_teams'
+    maps (round, judge) to the set of team IDs that judge has scored.
+    """
+    # Stat before reading so a concurrent write invalidates the cache
+    stamp = _scores_stamp()
+    if stamp is None:
+        return None
+    
+    # No lock needed: writers only append whole rows or atomically replace the file
+    if stamp != _scores_cache['stamp']:
+        try:
+            df = pd.read_csv(
+                SCORES_FILE,
+                dtype={col: str for col in SCORE_META_COLUMNS},
+                keep_default_na=False
+            )
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame(columns=_scores_headers())
         
-        # Get headers
-        criteria = get_criteria()
-        headers = ['timestamp', 'round', 'judge', 'team_id', 'team_name'] + [c['id'] for c in criteria]
+        # Score columns parse as numbers in C; blanks, junk and the missing
+        # trailing cells of retired criteria columns become 0.
+        # Integer score columns are downcast to the smallest int type.
+        for col in df.columns.difference(SCORE_META_COLUMNS):
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            df[col] = pd.to_numeric(df[col], downcast='integer')
         
-        # If file is empty or doesn't have headers, add them
-        if not existing_rows:
-            existing_rows = [headers]
+        # Keep the latest row per (round, judge, team), placed at the
+        # position of its first submission
+        rows = len(df)
+        keys = ['round', 'judge', 'team_id']
+        df = (df.assign(_first_seen=df.groupby(keys, sort=False).ngroup())
+                .drop_duplicates(keys, keep='last')
+                .sort_values('_first_seen', kind='stable')
+                .drop(columns='_first_seen')
+                .reset_index(drop=True))
         
-        # Check if this judge already scored this team in this round
-        updated = False
-        for i, row in enumerate(existing_rows[1:], start=1):
-            if len(row) >= 4 and row[1] == round_id and row[2] == judge and row[3] == team_id:
-                # Update existing score
-                timestamp = datetime.now().isoformat()
-                new_row = [timestamp, round_id, judge, team_id, team_name] + [scores.get(c['id'], 0) for c in criteria]
-                existing_rows[i] = new_row
-                updated = True
-                break
+        # Judges and teams repeat across rows; as categoricals, grouping
+        # works on integer codes instead of hashing strings
+        df['judge'] = df['judge'].astype('category')
+        df['team_id'] = df['team_id'].astype('category')
         
-        # If no existing score found, append new one
-        if not updated:
-            timestamp = datetime.now().isoformat()
-            new_row = [timestamp, round_id, judge, team_id, team_name] + [scores.get(c['id'], 0) for c in criteria]
-            existing_rows.append(new_row)
+        data = df.to_dict('records')
+        by_key = {(s['round'], s['judge'], s['team_id']): s for s in data}
+        judge_teams = {}
+        for round_id, judge, team_id in by_key:
+            judge_teams.setdefault((round_id, judge), set()).add(team_id)
         
-        # Write back all rows
-        with open(SCORES_FILE, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(existing_rows)
+        _scores_cache.update(rows=rows, df=df, data=data, by_key=by_key, judge_teams=judge_teams)
+        _scores_cache['stamp'] = stamp
+    
+    return _scores_cache
 
 
 def get_all_scores(round_id=None):
     """Read all scores from CSV file, optionally filtered by round."""
-    if not os.path.exists(SCORES_FILE):
+    cache = _load_scores()
+    if cache is None:
         return []
     
-    lock = FileLock(LOCK_FILE, timeout=10)
-    with lock:
-        with open(SCORES_FILE, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            scores = list(reader)
+    scores = cache['data']
+    if round_id:
+        return [s for s in scores if s.get('round') == round_id]
+    
+    return list(scores)
+
+
+def get_all_scores_df(round_id=None):
+    """Read all scores as a DataFrame, optionally filtered by round."""
+    cache = _load_scores()
+    if cache is None:
+        return pd.DataFrame(columns=_scores_headers())
     
+    df = cache['df']
     if round_id:
-        scores = [s for s in scores if s.get('round') == round_id]
+        return df[df['round'] == round_id]
     
-    return scores
+    return df
+
+
+def compact_scores():
+    """
+    Rewrite the scores CSV without superseded rows.
+    The cached load already knows whether any rows were superseded, so an
+    unchanged or already compact file costs no parse and no lock.
+    """
+    cache = _load_scores()
+    if cache is None or cache['rows'] == len(cache['df']):
+        return
+    
+    # Make sure every row matches the header before rewriting by name
+    _sync_scores_header()
+    
+    with _scores_rewrite_lock():
+        with open(SCORES_FILE, 'r', newline='') as f:
+            reader = csv.DictReader(f)
+            headers = reader.fieldnames or _scores_headers()
+            rows = list(reader)
+        
+        scores = _dedupe_scores(rows).values()
+        if len(scores) == len(rows):
+            # Another writer compacted the file first
+            return
+        
+        # Write to a temp file and swap it in so the CSV is never half-written
+        tmp_file = SCORES_FILE + '.tmp'
+        with open(tmp_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=headers, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(scores)
+        os.replace(tmp_file, SCORES_FILE)
 
 
 def get_judge_scores(judge, round_id=None):
@@ -224,15 +503,22 @@ def get_judge_scores(judge, round_id=None):
     return [s for s in all_scores if s.get('judge') == judge]
 
 
+def get_scored_team_ids(judge, round_id):
+    """Get the set of team IDs a judge has scored in a round."""
+    cache = _load_scores()
+    if cache is None:
+        return set()
+    return cache['judge_teams'].get((round_id, judge), set())
+
+
 def get_team_score_by_judge(judge, team_id, round_id=None):
     """Get scores for a specific team by a specific judge in a specific round."""
     if round_id is None:
         round_id = get_active_round()
-    judge_scores = get_judge_scores(judge, round_id)
-    for score in judge_scores:
-        if score.get('team_id') == team_id:
-            return score
-    return None
+    cache = _load_scores()
+    if cache is None:
+        return None
+    return cache['by_key'].get((round_id, judge, team_id))
 
 
 def normalize_scores(round_id=None):
@@ -241,91 +527,170 @@ def normalize_scores(round_id=None):
     This accounts for judges who are strict or lenient.
     Each judge's scores are normalized to have mean=0, std=1,
     then transformed to a 0-100 scale.
+    
+    Results are cached per configured round until scores.csv or
+    config.json changes.
     """
-    all_scores = get_all_scores(round_id)
-    if not all_scores:
-        return []
+    load_config()
+    key = (_scores_stamp(), _config_cache['mtime'])
+    cached = _normalized_cache.get(round_id)
+    if cached is not None and cached[0] == key:
+        return cached[1]
     
-    criteria = get_criteria()
-    criteria_ids = [c['id'] for c in criteria]
+    team_results = _compute_rankings(_load_and_prepare(round_id))
+    # Only cache configured rounds (and all rounds) so arbitrary ?round=
+    # values can't grow the cache
+    if round_id is None or any(r['id'] == round_id for r in get_rounds()):
+        _normalized_cache[round_id] = (key, team_results)
+    return team_results
+
+
+def _load_and_prepare(round_id=None):
+    """
+    Load the scores for a round and pack them into arrays for _compute_rankings().
+    Returns None when there are no scores.
+    """
+    scores_df = get_all_scores_df(round_id)
+    if scores_df.empty:
+        return None
     
-    # Convert to DataFrame for easier manipulation
-    df = pd.DataFrame(all_scores)
+    criteria_ids = _criteria_cached().ids
     
-    if df.empty:
-        return []
+    # Calculate total raw score for each entry (criteria added after
+    # scoring started count as 0 for older rows)
+    values = scores_df.reindex(columns=list(criteria_ids), fill_value=0).to_numpy()
     
-    # Convert score columns to numeric
-    for cid in criteria_ids:
-        if cid in df.columns:
-            df[cid] = pd.to_numeric(df[cid], errors='coerce').fillna(0)
+    # Group codes come straight from the categorical columns; dropping
+    # categories unused in this round keeps the codes dense
+    judge_codes = scores_df['judge'].cat.remove_unused_categories()
+    team_codes = scores_df['team_id'].cat.remove_unused_categories().cat.codes.to_numpy()
+    _, first_seen, team_idx = np.unique(team_codes, return_index=True, return_inverse=True)
     
-    # Calculate total raw score for each entry
-    df['total_raw'] = df[criteria_ids].sum(axis=1)
+    prepared = {
+        'judges': scores_df['judge'].tolist(),
+        'team_ids': scores_df['team_id'].tolist(),
+        'team_names': scores_df['team_name'].tolist(),
+        'totals': values.sum(axis=1),
+        'judge_idx': judge_codes.cat.codes.to_numpy(),
+        'n_judges': len(judge_codes.cat.categories),
+        'team_idx': team_idx,
+        'first_seen': first_seen
+    }
+    return prepared
+
+
+def _normalize_arrays_numpy(totals, judge_idx, n_judges, team_idx, n_teams):
+    """
+    Per-judge z-score normalization and per-team sums on flat arrays.
+    Returns (normalized, team_raw_sums, team_norm_sums, team_counts).
+    """
+    # Judges with a single score or identical scores can't be
+    # normalized and get a z-score of 0.
+    judge_counts = np.bincount(judge_idx, minlength=n_judges)
+    judge_means = np.bincount(judge_idx, weights=totals, minlength=n_judges) / judge_counts
+    deviations = totals - judge_means[judge_idx]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Sample std (ddof=1), matching the previous pandas behaviour
+        judge_stds = np.sqrt(np.bincount(judge_idx, weights=deviations ** 2, minlength=n_judges) / (judge_counts - 1))
+        row_stds = judge_stds[judge_idx]
+        z_scores = np.where(row_stds > 0, deviations / row_stds, 0.0)
     
-    # Z-score normalize per judge (within the filtered round)
-    normalized_data = []
+    # Convert Z-scores to 0-100 scale (assuming Z-scores typically range from -3 to 3)
+    # Map z-score to 0-100: z=-3 -> 0, z=0 -> 50, z=3 -> 100
+    normalized = np.clip((z_scores + 3) * (100 / 6), 0, 100).round(2)
     
-    for judge in df['judge'].unique():
-        judge_df = df[df['judge'] == judge].copy()
-        
-        if len(judge_df) > 1:
-            # Calculate mean and std for this judge's total scores
-            mean_score = judge_df['total_raw'].mean()
-            std_score = judge_df['total_raw'].std()
-            
-            if std_score > 0:
-                # Z-score normalization
-                judge_df['z_score'] = (judge_df['total_raw'] - mean_score) / std_score
-            else:
-                judge_df['z_score'] = 0
-        else:
-            # Only one score from this judge, can't normalize
-            judge_df['z_score'] = 0
-        
-        normalized_data.append(judge_df)
+    team_counts = np.bincount(team_idx, minlength=n_teams)
+    team_raw_sums = np.bincount(team_idx, weights=totals, minlength=n_teams)
+    team_norm_sums = np.bincount(team_idx, weights=normalized, minlength=n_teams)
+    return normalized, team_raw_sums, team_norm_sums, team_counts
+
+
+def _normalize_arrays_loops(totals, judge_idx, n_judges, team_idx, n_teams):
+    """Loop form of _normalize_arrays_numpy(), only used when compiled with numba."""
+    n = totals.shape[0]
+    judge_sums = np.zeros(n_judges)
+    judge_counts = np.zeros(n_judges, dtype=np.int64)
+    for i in range(n):
+        judge_sums[judge_idx[i]] += totals[i]
+        judge_counts[judge_idx[i]] += 1
+    judge_means = judge_sums / judge_counts
     
-    if not normalized_data:
+    judge_sq_devs = np.zeros(n_judges)
+    for i in range(n):
+        d = totals[i] - judge_means[judge_idx[i]]
+        judge_sq_devs[judge_idx[i]] += d * d
+    
+    z_scores = np.zeros(n)
+    for i in range(n):
+        j = judge_idx[i]
+        if judge_counts[j] > 1:
+            std = np.sqrt(judge_sq_devs[j] / (judge_counts[j] - 1))
+            if std > 0:
+                z_scores[i] = (totals[i] - judge_means[j]) / std
+    normalized = np.round(np.minimum(np.maximum((z_scores + 3) * (100 / 6), 0.0), 100.0), 2)
+    
+    team_counts = np.zeros(n_teams, dtype=np.int64)
+    team_raw_sums = np.zeros(n_teams)
+    team_norm_sums = np.zeros(n_teams)
+    for i in range(n):
+        t = team_idx[i]
+        team_counts[t] += 1
+        team_raw_sums[t] += totals[i]
+        team_norm_sums[t] += normalized[i]
+    return normalized, team_raw_sums, team_norm_sums, team_counts
+
+
+if njit is not None:
+    _normalize_arrays = njit(cache=True)(_normalize_arrays_loops)
+else:
+    _normalize_arrays = _normalize_arrays_numpy
+
+
+def _compute_rankings(prepared):
+    """
+    Compute normalized, ranked team results from _load_and_prepare() output.
+    Works on plain NumPy arrays - score data is small enough that
+    DataFrame overhead would dominate the actual arithmetic.
+    """
+    if prepared is None:
         return []
     
-    result_df = pd.concat(normalized_data, ignore_index=True)
+    judges = prepared['judges']
+    team_ids = prepared['team_ids']
+    team_names = prepared['team_names']
+    totals = prepared['totals']
+    team_idx = prepared['team_idx']
+    first_seen = prepared['first_seen']
     
-    # Convert Z-scores to 0-100 scale (assuming Z-scores typically range from -3 to 3)
-    # Map z-score to 0-100: z=-3 -> 0, z=0 -> 50, z=3 -> 100
-    result_df['normalized_score'] = ((result_df['z_score'] + 3) / 6 * 100).clip(0, 100).round(2)
+    # Z-score normalize per judge (within the filtered round), then
+    # aggregate by team, keeping teams in first-scored order for ties
+    normalized, team_raw_sums, team_norm_sums, team_counts = _normalize_arrays(
+        totals.astype(np.float64), prepared['judge_idx'], prepared['n_judges'], team_idx, len(first_seen)
+    )
+    avg_raw = (team_raw_sums / team_counts).round(2)
+    avg_normalized = (team_norm_sums / team_counts).round(2)
     
-    # Aggregate by team
-    team_results = []
-    for team_id in result_df['team_id'].unique():
-        team_data = result_df[result_df['team_id'] == team_id]
-        team_name = team_data['team_name'].iloc[0]
-        
-        avg_raw = team_data['total_raw'].mean()
-        avg_normalized = team_data['normalized_score'].mean()
-        num_judges = len(team_data)
-        
-        # Individual judge scores for this team
-        judge_scores = []
-        for _, row in team_data.iterrows():
-            judge_scores.append({
-                'judge': row['judge'],
-                'raw_score': row['total_raw'],
-                'normalized_score': row['normalized_score']
-            })
-        
-        team_results.append({
-            'team_id': team_id,
-            'team_name': team_name,
-            'avg_raw_score': round(avg_raw, 2),
-            'avg_normalized_score': round(avg_normalized, 2),
-            'num_judges': num_judges,
-            'judge_scores': judge_scores
-        })
+    # Sort by normalized score descending, first-scored team first on ties
+    order = np.lexsort((first_seen, -avg_normalized))
     
-    # Sort by normalized score descending
-    team_results.sort(key=lambda x: x['avg_normalized_score'], reverse=True)
+    # Individual judge scores for each team: one stable sort groups the rows
+    # by team (keeping submission order), then each team takes a slice
+    row_order = np.argsort(team_idx, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(team_counts))).tolist()
+    judge_rows = [{
+        'judge': judges[i],
+        'raw_score': raw_score,
+        'normalized_score': norm_score
+    } for i, raw_score, norm_score in zip(row_order.tolist(), totals[row_order].tolist(), normalized[row_order].tolist())]
     
-    return team_results
+    return [{
+        'team_id': team_ids[first_seen[t]],
+        'team_name': team_names[first_seen[t]],
+        'avg_raw_score': avg_raw[t].item(),
+        'avg_normalized_score': avg_normalized[t].item(),
+        'num_judges': team_counts[t].item(),
+        'judge_scores': judge_rows[bounds[t]:bounds[t + 1]]
+    } for t in order.tolist()]
 
 
 def login_required(f):
@@ -349,6 +714,22 @@ def admin_required(f):
     return decorated_function
 
 
+def json_response(obj):
+    """Serialize obj to a JSON response with orjson (handles NumPy values natively)."""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS),
+        mimetype='application/json'
+    )
+
+
+@app.cli.command('hash-password')
+def hash_password_command():
+    """Print a password hash to paste into config.json."""
+    import click
+    password = click.prompt('Password', hide_input=True, confirmation_prompt=True)
+    click.echo(generate_password_hash(password))
+
+
 # Initialize scores file on startup
 init_scores_file()
 
@@ -372,18 +753,23 @@ def login():
         
         # Check admin credentials first
         admins = get_admins()
-        if username in admins and admins[username] == password:
+        if username in admins and check_password(admins[username], password):
             session['admin'] = username
             flash('Admin login successful', 'success')
             return redirect(url_for('results'))
         
         # Then check judge credentials
         judges = get_judges()
-        if username in judges and judges[username] == password:
+        if username in judges and check_password(judges[username], password):
             session['judge'] = username
             flash('Login successful', 'success')
             return redirect(url_for('dashboard'))
         
+        if username not in admins and username not in judges:
+            # Spend the same hashing time as a real check so response
+            # timing doesn't reveal which usernames exist
+            check_password_hash(_DUMMY_PASSWORD_HASH, password)
+        
         flash('Invalid username or password', 'error')
     
     return render_template('login.html')
@@ -415,11 +801,8 @@ def dashboard():
             round_name = r['name']
             break
     
-    # Get scores for current round only
-    judge_scores = get_judge_scores(judge, active_round)
-    
-    # Mark which teams have been scored in this round
-    scored_team_ids = {s['team_id'] for s in judge_scores}
+    # Mark which teams have been scored in the current round
+    scored_team_ids = get_scored_team_ids(judge, active_round)
     
     teams_with_status = []
     for team in teams:
@@ -481,15 +864,15 @@ def score_team(team_id):
             flash('Scoring is currently closed', 'error')
             return redirect(url_for('dashboard'))
         
-        scores = {}
-        for c in criteria:
-            score_value = request.form.get(c['id'], 0)
-            try:
-                score_value = int(score_value)
-                score_value = max(0, min(score_value, c['max_score']))
-            except (ValueError, TypeError):
-                score_value = 0
-            scores[c['id']] = score_value
+        # Parse all criteria at once and clamp them to [0, max_score]
+        criteria_info = _criteria_cached()
+        try:
+            raw = np.array([int(request.form.get(cid, 0) or 0) for cid in criteria_info.ids], dtype=np.int64)
+        except (ValueError, TypeError, OverflowError):
+            flash('Scores must be whole numbers', 'error')
+            return redirect(url_for('score_team', team_id=team_id))
+        clamped = np.clip(raw, 0, criteria_info.max_scores)
+        scores = dict(zip(criteria_info.ids, clamped.tolist()))
         
         save_scores(judge, team['id'], team['name'], scores, active_round)
         flash(f'Scores saved for {team["name"]} ({round_name})', 'success')
@@ -526,8 +909,7 @@ def results():
             break
     
     team_results = normalize_scores(selected_round)
-    criteria = get_criteria()
-    max_possible = sum(c['max_score'] for c in criteria)
+    max_possible = _criteria_cached().max_possible
     
     return render_template('results.html',
                          admin=admin,
@@ -575,10 +957,10 @@ def admin_toggle_scoring():
 @admin_required
 def export_results():
     """Export results to XLSX with two sheets: Rankings and Raw Scores."""
-    from flask import Response
-    import io
     from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+    from openpyxl.utils import get_column_letter
     
     # Get selected round from query params
     selected_round = request.args.get('round')
@@ -591,20 +973,20 @@ def export_results():
             round_name = r['name'].replace(' ', '_')
             break
     
+    # Drop superseded rows so the exported CSV-backed data stays small
+    compact_scores()
+    
+    # Both sheets come from the cached scores load, and rankings from the
+    # normalization cache, so an unchanged file is neither re-read nor re-ranked
     team_results = normalize_scores(selected_round)
-    criteria = get_criteria()
-    max_possible = sum(c['max_score'] for c in criteria)
-    all_scores = get_all_scores(selected_round)
+    scores_df = get_all_scores_df(selected_round)
+    criteria_info = _criteria_cached()
     
-    # Create workbook
-    wb = Workbook()
+    # Create a write-only workbook: rows are streamed out instead of
+    # being kept as an in-memory cell graph
+    wb = Workbook(write_only=True)
     
-    # --- Sheet 1: Rankings ---
-    ws1 = wb.active
-    ws1.title = "Rankings"
-    
-    # Header style
-    header_font = Font(bold=True)
+    # Cell styles, registered once and assigned to cells by name
     header_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
     header_font_white = Font(bold=True, color="FFFFFF")
     thin_border = Border(
@@ -613,15 +995,45 @@ def export_results():
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
+    center = Alignment(horizontal='center')
+    wb.add_named_style(NamedStyle(
+        name='header',
+        font=header_font_white,
+        fill=header_fill,
+        border=thin_border,
+        alignment=center
+    ))
+    wb.add_named_style(NamedStyle(name='body', border=thin_border))
+    wb.add_named_style(NamedStyle(name='body_center', border=thin_border, alignment=center))
+    
+    def styled_row(ws, values, center_cols=()):
+        """Wrap row values in bordered cells, centering the given (1-based) columns."""
+        row = []
+        for col, value in enumerate(values, 1):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = 'body_center' if col in center_cols else 'body'
+            row.append(cell)
+        return row
+    
+    def header_row(ws, headers):
+        """Wrap header values in cells using the shared header style."""
+        row = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = 'header'
+            row.append(cell)
+        return row
+    
+    # --- Sheet 1: Rankings ---
+    ws1 = wb.create_sheet(title="Rankings")
+    
+    # Column widths must be set before any rows are streamed
+    for i, width in enumerate([8, 15, 25, 15, 12, 20, 12], 1):
+        ws1.column_dimensions[get_column_letter(i)].width = width
     
     # Write headers for Rankings
     ranking_headers = ['Rank', 'Team ID', 'Team Name', 'Avg Raw Score', 'Max Possible', 'Avg Normalized Score', 'Num Judges']
-    for col, header in enumerate(ranking_headers, 1):
-        cell = ws1.cell(row=1, column=col, value=header)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
-        cell.border = thin_border
+    ws1.append(header_row(ws1, ranking_headers))
     
     # Write ranking data
     for i, result in enumerate(team_results, 1):
@@ -630,88 +1042,62 @@ def export_results():
             result['team_id'],
             result['team_name'],
             result['avg_raw_score'],
-            max_possible,
+            criteria_info.max_possible,
             result['avg_normalized_score'],
             result['num_judges']
         ]
-        for col, value in enumerate(row_data, 1):
-            cell = ws1.cell(row=i+1, column=col, value=value)
-            cell.border = thin_border
-            if col in [1, 4, 5, 6, 7]:
-                cell.alignment = Alignment(horizontal='center')
-    
-    # Adjust column widths for Rankings
-    ws1.column_dimensions['A'].width = 8
-    ws1.column_dimensions['B'].width = 15
-    ws1.column_dimensions['C'].width = 25
-    ws1.column_dimensions['D'].width = 15
-    ws1.column_dimensions['E'].width = 12
-    ws1.column_dimensions['F'].width = 20
-    ws1.column_dimensions['G'].width = 12
+        ws1.append(styled_row(ws1, row_data, center_cols=(1, 4, 5, 6, 7)))
     
     # --- Sheet 2: Raw Scores (scores.csv data) ---
     ws2 = wb.create_sheet(title="Raw Scores")
     
     # Get headers from criteria
-    criteria_ids = [c['id'] for c in criteria]
-    criteria_names = {c['id']: c['name'] for c in criteria}
-    raw_headers = ['Timestamp', 'Judge', 'Team ID', 'Team Name'] + [criteria_names.get(cid, cid) for cid in criteria_ids]
+    raw_headers = ['Timestamp', 'Judge', 'Team ID', 'Team Name'] + [criteria_info.names.get(cid, cid) for cid in criteria_info.ids]
+    
+    # Adjust column widths for Raw Scores
+    for i, width in enumerate([22, 12, 15, 25] + [18] * len(criteria_info.ids), 1):
+        ws2.column_dimensions[get_column_letter(i)].width = width
     
     # Write headers for Raw Scores
-    for col, header in enumerate(raw_headers, 1):
-        cell = ws2.cell(row=1, column=col, value=header)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
-        cell.border = thin_border
-    
-    # Write raw score data
-    for row_idx, score in enumerate(all_scores, 2):
-        row_data = [
-            score.get('timestamp', ''),
-            score.get('judge', ''),
-            score.get('team_id', ''),
-            score.get('team_name', '')
-        ] + [score.get(cid, 0) for cid in criteria_ids]
-        
-        for col, value in enumerate(row_data, 1):
-            cell = ws2.cell(row=row_idx, column=col, value=value)
-            cell.border = thin_border
-            if col > 4:  # Score columns
-                cell.alignment = Alignment(horizontal='center')
+    ws2.append(header_row(ws2, raw_headers))
     
-    # Adjust column widths for Raw Scores
-    ws2.column_dimensions['A'].width = 22
-    ws2.column_dimensions['B'].width = 12
-    ws2.column_dimensions['C'].width = 15
-    ws2.column_dimensions['D'].width = 25
-    for i, _ in enumerate(criteria_ids, 5):
-        ws2.column_dimensions[chr(64 + i)].width = 18
-    
-    # Save to BytesIO
-    output = io.BytesIO()
+    # Write raw score data (score columns centered)
+    score_cols = range(5, len(raw_headers) + 1)
+    raw_columns = ['timestamp', 'judge', 'team_id', 'team_name'] + list(criteria_info.ids)
+    raw_rows = scores_df.reindex(columns=raw_columns, fill_value=0).itertuples(index=False)
+    for row_data in raw_rows:
+        ws2.append(styled_row(ws2, row_data, center_cols=score_cols))
+    
+    # Save to an anonymous temp file (removed once the response closes it)
+    # and stream it from disk rather than copying an in-memory buffer
+    output = tempfile.TemporaryFile(suffix='.xlsx')
     wb.save(output)
     output.seek(0)
     
-    return Response(
-        output.getvalue(),
+    response = send_file(
+        output,
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': f'attachment; filename=hackathon_results_{round_name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'}
+        as_attachment=True,
+        download_name=f'hackathon_results_{round_name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
     )
+    # send_file can't stat an anonymous file itself, so set the size for
+    # download progress
+    response.content_length = os.fstat(output.fileno()).st_size
+    return response
 
 
 @app.route('/api/scores', methods=['GET'])
 @admin_required
 def api_scores():
     """API endpoint to get all scores (admin only)."""
-    return jsonify(get_all_scores())
+    return json_response(get_all_scores())
 
 
 @app.route('/api/normalized', methods=['GET'])
 @admin_required
 def api_normalized():
     """API endpoint to get normalized scores (admin only)."""
-    return jsonify(normalize_scores())
+    return json_response(normalize_scores())
 
 
 if __name__ == '__main__':